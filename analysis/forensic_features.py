@@ -1,44 +1,101 @@
+import numpy as np
 import pandas as pd
+from numba import njit
 from pathlib import Path
+from typing import Optional
+
+from message_store import conversation_stats, load_messages, save_outputs
 
 
-DATA_PATH = Path("data/processed/clean_messages.csv")
 OUTPUT_DIR = Path("analysis/outputs/features")
 
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+BURST_THRESHOLD_SECONDS = 60
 
 
-def load_messages() -> pd.DataFrame:
-    df = pd.read_csv(DATA_PATH, parse_dates=["conversation_datetime"])
-    df = df.sort_values(by=["conversation_uid", "conversation_datetime", "message_sequence"])
-    return df
+NAT_NS = np.iinfo(np.int64).min
 
 
-def compute_time_gaps(df: pd.DataFrame) -> pd.DataFrame:
+@njit(cache=True)
+def _time_gaps(codes, timestamps, n_groups, burst_threshold_seconds):
+    """
+    Per-group shift(1) of the timestamps, the resulting gap in seconds and
+    the burst flag (gap <= threshold), all in a single pass. Rows with a
+    negative group code have no previous message.
+    """
+    n = len(codes)
+    prev = np.full(n, NAT_NS, dtype=np.int64)
+    gaps = np.full(n, np.nan)
+    is_burst = np.zeros(n, dtype=np.bool_)
+    last = np.full(n_groups, NAT_NS, dtype=np.int64)
+    seen = np.zeros(n_groups, dtype=np.bool_)
+    for i in range(n):
+        code = codes[i]
+        if code < 0:
+            continue
+        if seen[code]:
+            prev[i] = last[code]
+            if timestamps[i] != NAT_NS and prev[i] != NAT_NS:
+                gaps[i] = (timestamps[i] - prev[i]) / 1e9
+                is_burst[i] = gaps[i] <= burst_threshold_seconds
+        last[code] = timestamps[i]
+        seen[code] = True
+    return prev, gaps, is_burst
+
+
+@njit(cache=True)
+def _burst_counts(codes, is_burst, counted, n_groups):
+    """
+    Per-group number of burst messages and of counted messages, in a
+    single pass.
+    """
+    burst = np.zeros(n_groups, dtype=np.int64)
+    total = np.zeros(n_groups, dtype=np.int64)
+    for i in range(len(codes)):
+        code = codes[i]
+        if code < 0:
+            continue
+        if is_burst[i]:
+            burst[code] += 1
+        if counted[i]:
+            total[code] += 1
+    return burst, total
+
+
+def compute_time_gaps(df: pd.DataFrame, burst_threshold_seconds: int = 60) -> pd.DataFrame:
     """
     Compute time gaps (in seconds) between consecutive messages within the same conversation.
+    Burst messages (gap <= threshold) are flagged in the same pass.
     """
     df = df.copy()
-    df["prev_message_time"] = df.groupby("conversation_uid")["conversation_datetime"].shift(1)
-    df["time_gap_seconds"] = (df["conversation_datetime"] - df["prev_message_time"]).dt.total_seconds()
+    codes, uniques = pd.factorize(df["conversation_uid"])
+    timestamps = df["conversation_datetime"].to_numpy(dtype="datetime64[ns]").view("i8")
+
+    prev, gaps, is_burst = _time_gaps(
+        codes, timestamps, len(uniques), float(burst_threshold_seconds)
+    )
+
+    df["prev_message_time"] = prev.view("datetime64[ns]")
+    df["time_gap_seconds"] = gaps
+    df["is_burst_message"] = is_burst
     return df
 
 
-def conversation_duration(df: pd.DataFrame) -> pd.DataFrame:
+def conversation_duration(df: pd.DataFrame, stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Compute total duration of each conversation (in seconds).
     """
-    result = (
-        df.groupby("conversation_uid")
-        .agg(
-            conversation_start=("conversation_datetime", "min"),
-            conversation_end=("conversation_datetime", "max"),
-            message_count=("message_text", "count"),
-            participant_count=("sender_email", "nunique"),
-            has_deleted=("has_deleted_in_conversation", "max"),
-        )
-        .reset_index()
-    )
+    if stats is None:
+        stats = conversation_stats(df)
+    result = stats[
+        [
+            "conversation_uid",
+            "conversation_start",
+            "conversation_end",
+            "message_count",
+            "participant_count",
+            "has_deleted",
+        ]
+    ].copy()
 
     result["conversation_duration_seconds"] = (
         result["conversation_end"] - result["conversation_start"]
@@ -47,21 +104,36 @@ def conversation_duration(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def burst_activity(df: pd.DataFrame, burst_threshold_seconds: int = 60) -> pd.DataFrame:
+def burst_activity(
+    df: pd.DataFrame,
+    burst_threshold_seconds: int = 60,
+    is_burst: Optional[pd.Series] = None,
+) -> pd.DataFrame:
     """
     Identify burst activity: messages sent within a short time window compared to the previous message.
     A burst message is defined as a message whose time gap to the previous message is <= threshold.
+    Flags already computed for the same threshold (is_burst_message from
+    compute_time_gaps) can be passed as `is_burst`; otherwise they are
+    derived from time_gap_seconds.
     """
-    df = df.copy()
-    df["is_burst_message"] = df["time_gap_seconds"].le(burst_threshold_seconds)
-
-    burst_summary = (
-        df.groupby("conversation_uid")
-        .agg(
-            burst_message_count=("is_burst_message", "sum"),
-            total_messages=("message_text", "count"),
-        )
-        .reset_index()
+    if is_burst is None:
+        is_burst = df["time_gap_seconds"].le(burst_threshold_seconds)
+    is_burst = is_burst.to_numpy(dtype=bool)
+
+    codes, uniques = pd.factorize(df["conversation_uid"], sort=True)
+    burst_count, total_count = _burst_counts(
+        codes,
+        is_burst,
+        df["message_text"].notna().to_numpy(),
+        len(uniques),
+    )
+
+    burst_summary = pd.DataFrame(
+        {
+            "conversation_uid": uniques,
+            "burst_message_count": burst_count,
+            "total_messages": total_count,
+        }
     )
 
     burst_summary["burst_ratio"] = burst_summary["burst_message_count"] / burst_summary["total_messages"]
@@ -71,8 +143,9 @@ def burst_activity(df: pd.DataFrame, burst_threshold_seconds: int = 60) -> pd.Da
 
 
 def main():
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     df = load_messages()
-    df = compute_time_gaps(df)
+    df = compute_time_gaps(df, burst_threshold_seconds=BURST_THRESHOLD_SECONDS)
 
     # Message-level features (time gaps)
     message_time_gaps = df[
@@ -87,18 +160,26 @@ def main():
     ].copy()
 
     # Conversation-level features (duration, burst)
-    duration = conversation_duration(df)
-    burst = burst_activity(df, burst_threshold_seconds=60)
+    duration = conversation_duration(df, conversation_stats(df))
+    burst = burst_activity(
+        df,
+        burst_threshold_seconds=BURST_THRESHOLD_SECONDS,
+        is_burst=df["is_burst_message"],
+    )
 
     # Save outputs
-    message_time_gaps.to_csv(OUTPUT_DIR / "message_time_gaps.csv", index=False)
-    duration.to_csv(OUTPUT_DIR / "conversation_duration.csv", index=False)
-    burst.to_csv(OUTPUT_DIR / "burst_activity.csv", index=False)
+    paths = save_outputs(
+        {
+            "message_time_gaps": message_time_gaps,
+            "conversation_duration": duration,
+            "burst_activity": burst,
+        },
+        OUTPUT_DIR,
+    )
 
     print("Forensic temporal features generated:")
-    print(f"- {OUTPUT_DIR / 'message_time_gaps.csv'}")
-    print(f"- {OUTPUT_DIR / 'conversation_duration.csv'}")
-    print(f"- {OUTPUT_DIR / 'burst_activity.csv'}")
+    for path in paths:
+        print(f"- {path}")
 
 
 if __name__ == "__main__":
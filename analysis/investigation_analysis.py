@@ -1,32 +1,29 @@
 import pandas as pd
 from pathlib import Path
+from typing import Optional
 
-
-DATA_PATH = Path("data/processed/clean_messages.csv")
-OUTPUT_DIR = Path("analysis/outputs")
-
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+from message_store import conversation_stats, load_messages, save_outputs
 
 
-def load_messages() -> pd.DataFrame:
-    df = pd.read_csv(DATA_PATH, parse_dates=["conversation_datetime"])
-    return df
+OUTPUT_DIR = Path("analysis/outputs")
 
 
-def conversations_with_deleted_messages(df: pd.DataFrame) -> pd.DataFrame:
+def conversations_with_deleted_messages(df: pd.DataFrame, stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Identify conversations that contain at least one deleted message.
     """
-    result = (
-        df[df["message_status"] == "deleted"]
-        .groupby("conversation_uid")
-        .agg(
-            deleted_message_count=("message_status", "count"),
-            total_messages=("message_status", "size"),
-        )
-        .reset_index()
-        .sort_values("deleted_message_count", ascending=False)
-    )
+    if stats is None:
+        stats = conversation_stats(df)
+    deleted = stats.loc[stats["deleted_count"] > 0]
+    # total_messages counts the deleted messages of the conversation
+    # (size of its deleted-message group), as in the original output
+    result = pd.DataFrame(
+        {
+            "conversation_uid": deleted["conversation_uid"],
+            "deleted_message_count": deleted["deleted_count"],
+            "total_messages": deleted["deleted_count"],
+        }
+    ).sort_values("deleted_message_count", ascending=False)
     return result
 
 
@@ -34,11 +31,25 @@ def participant_activity(df: pd.DataFrame) -> pd.DataFrame:
     """
     Count messages sent per participant.
     """
+    message_count = df.groupby("sender_email", observed=True)["message_text"].count()
+
+    # Distinct conversations per sender, counted on deduplicated pairs
+    # rather than with a per-group nunique
+    conversations_involved = (
+        df[["sender_email", "conversation_uid"]]
+        .dropna()
+        .drop_duplicates()
+        .groupby("sender_email", observed=True)
+        .size()
+        .reindex(message_count.index, fill_value=0)
+    )
+
     result = (
-        df.groupby("sender_email")
-        .agg(
-            message_count=("message_text", "count"),
-            conversations_involved=("conversation_uid", "nunique"),
+        pd.DataFrame(
+            {
+                "message_count": message_count,
+                "conversations_involved": conversations_involved,
+            }
         )
         .reset_index()
         .sort_values("message_count", ascending=False)
@@ -46,20 +57,15 @@ def participant_activity(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def conversation_volume(df: pd.DataFrame) -> pd.DataFrame:
+def conversation_volume(df: pd.DataFrame, stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Measure message volume per conversation.
     """
-    result = (
-        df.groupby("conversation_uid")
-        .agg(
-            message_count=("message_text", "count"),
-            participant_count=("sender_email", "nunique"),
-            has_deleted=("has_deleted_in_conversation", "max"),
-        )
-        .reset_index()
-        .sort_values("message_count", ascending=False)
-    )
+    if stats is None:
+        stats = conversation_stats(df)
+    result = stats[
+        ["conversation_uid", "message_count", "participant_count", "has_deleted"]
+    ].sort_values("message_count", ascending=False)
     return result
 
 
@@ -67,34 +73,45 @@ def timeline_activity(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate message activity over time (hour-level).
     """
-    df["hour"] = df["conversation_datetime"].dt.floor("h")
+    # Undated messages fall in no hour (as with groupby on a floored
+    # column), and Grouper cannot bin an all-NaT column
+    dated = df[df["conversation_datetime"].notna()]
+
+    # Hourly bucketing without materialising a floored datetime column
     result = (
-        df.groupby("hour")
+        dated.groupby(pd.Grouper(key="conversation_datetime", freq="h"))
         .size()
+        .rename_axis("hour")
         .reset_index(name="message_count")
-        .sort_values("hour")
     )
+    # Binning also emits the empty hours in between: keep active hours only
+    result = result[result["message_count"] > 0]
     return result
 
 
 def main():
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     df = load_messages()
+    stats = conversation_stats(df)
 
-    deleted_conv = conversations_with_deleted_messages(df)
+    deleted_conv = conversations_with_deleted_messages(df, stats)
     participants = participant_activity(df)
-    conv_volume = conversation_volume(df)
+    conv_volume = conversation_volume(df, stats)
     timeline = timeline_activity(df)
 
-    deleted_conv.to_csv(OUTPUT_DIR / "conversations_with_deleted_messages.csv", index=False)
-    participants.to_csv(OUTPUT_DIR / "participant_activity.csv", index=False)
-    conv_volume.to_csv(OUTPUT_DIR / "conversation_volume.csv", index=False)
-    timeline.to_csv(OUTPUT_DIR / "timeline_activity.csv", index=False)
+    paths = save_outputs(
+        {
+            "conversations_with_deleted_messages": deleted_conv,
+            "participant_activity": participants,
+            "conversation_volume": conv_volume,
+            "timeline_activity": timeline,
+        },
+        OUTPUT_DIR,
+    )
 
     print("Investigation-ready analyses generated:")
-    print(f"- {OUTPUT_DIR / 'conversations_with_deleted_messages.csv'}")
-    print(f"- {OUTPUT_DIR / 'participant_activity.csv'}")
-    print(f"- {OUTPUT_DIR / 'conversation_volume.csv'}")
-    print(f"- {OUTPUT_DIR / 'timeline_activity.csv'}")
+    for path in paths:
+        print(f"- {path}")
 
 
 if __name__ == "__main__":
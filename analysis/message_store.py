@@ -0,0 +1,123 @@
+import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+# csv (default) or parquet, matching the pipeline's --format
+DATA_FORMAT = os.environ.get("DATA_FORMAT", "csv")
+
+DATA_PATH = Path(f"data/processed/clean_messages.{DATA_FORMAT}")
+
+# Same categories (and codes) as the pipeline's message_status column
+MESSAGE_STATUS_DTYPE = pd.CategoricalDtype(["normal", "deleted"])
+DELETED_CODE = MESSAGE_STATUS_DTYPE.categories.get_loc("deleted")
+
+# pandas' default NA tokens (as deloitte_forensic.io.NA_VALUES), so the
+# Arrow reader nulls the same cells as pd.read_csv
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+
+def _read_csv_arrow(path: Path) -> pd.DataFrame:
+    """
+    PyArrow fast path (USE_ARROW_IO=1): parallel parse, with the datetime
+    column typed at parse time instead of reparsed by pandas.
+    """
+    import pyarrow as pa
+    from pyarrow import csv
+
+    table = csv.read_csv(
+        path,
+        parse_options=csv.ParseOptions(newlines_in_values=True),
+        convert_options=csv.ConvertOptions(
+            column_types={"conversation_datetime": pa.timestamp("ns")},
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+
+def _empty_strings_to_na(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Empty strings as missing values, as they read back from the CSV
+    output, so counts (e.g. of message_text) do not depend on DATA_FORMAT.
+    """
+    for name, dtype in df.dtypes.items():
+        if pd.api.types.is_string_dtype(dtype):
+            df[name] = df[name].replace("", None)
+    return df
+
+
+def load_messages() -> pd.DataFrame:
+    """
+    Load the message-level pipeline output, sorted by conversation and
+    time, with conversation_uid and sender_email as categoricals.
+    """
+    if DATA_FORMAT == "parquet":
+        # Typed columns: no datetime reparse, Arrow-backed strings
+        df = pd.read_parquet(DATA_PATH, engine="pyarrow", dtype_backend="pyarrow")
+        df = _empty_strings_to_na(df)
+    elif os.environ.get("USE_ARROW_IO") == "1":
+        df = _read_csv_arrow(DATA_PATH)
+    else:
+        df = pd.read_csv(DATA_PATH, parse_dates=["conversation_datetime"])
+    df["message_status"] = df["message_status"].astype(MESSAGE_STATUS_DTYPE)
+    df = df.sort_values(by=["conversation_uid", "conversation_datetime", "message_sequence"])
+    # Group keys as categoricals: groupbys hash int32 codes, not strings.
+    # Sorted once, so groupbys on conversation_uid can use sort=False and
+    # still emit groups in order.
+    df["conversation_uid"] = df["conversation_uid"].astype("category")
+    df["sender_email"] = df["sender_email"].astype("category")
+    return df
+
+
+def conversation_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Conversation-level statistics shared by the duration, volume and
+    deleted-message analyses, computed in a single groupby pass.
+    """
+    is_deleted = df["message_status"].astype(MESSAGE_STATUS_DTYPE).cat.codes.eq(DELETED_CODE)
+    return (
+        df.assign(is_deleted=is_deleted)
+        .groupby("conversation_uid", sort=False, observed=True)
+        .agg(
+            conversation_start=("conversation_datetime", "min"),
+            conversation_end=("conversation_datetime", "max"),
+            message_count=("message_text", "count"),
+            participant_count=("sender_email", "nunique"),
+            has_deleted=("has_deleted_in_conversation", "max"),
+            deleted_count=("is_deleted", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def save_output(df: pd.DataFrame, output_dir: Path, name: str) -> Path:
+    """
+    Write an output table in DATA_FORMAT and return its path.
+    """
+    path = output_dir / f"{name}.{DATA_FORMAT}"
+    if DATA_FORMAT == "parquet":
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def save_outputs(outputs: dict, output_dir: Path) -> list:
+    """
+    Write several output tables ({name: df}) concurrently and return
+    their paths in the given order. Serialisation and compression release
+    the GIL for most of the work, so independent files overlap.
+    """
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(save_output, df, output_dir, name)
+            for name, df in outputs.items()
+        ]
+        return [future.result() for future in futures]
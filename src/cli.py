@@ -1,10 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
 
 import typer
 from rich import print
 
-from deloitte_forensic.io import read_raw_csv
-from deloitte_forensic.transform import transform_conversation_export
+from deloitte_forensic.io import (
+    ChunkedWriter,
+    iter_raw_csv,
+    messages_schema,
+    summary_schema,
+)
+from deloitte_forensic.transform import transform_conversation_export_chunks
 from deloitte_forensic.validate import basic_validation
 
 app = typer.Typer(
@@ -12,30 +19,63 @@ app = typer.Typer(
 )
 
 
+class OutputFormat(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
 @app.command()
 def run(
     input_path: str = typer.Option(..., help="Path to raw conversation CSV"),
     out_dir: str = typer.Option("data/processed", help="Output directory"),
+    chunksize: int = typer.Option(
+        1_000_000,
+        min=1,
+        help="Raw rows read per chunk (pandas reader; ignored with USE_ARROW_IO=1)",
+    ),
+    fmt: OutputFormat = typer.Option(
+        OutputFormat.csv, "--format", help="Output file format"
+    ),
 ):
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
 
-    raw = read_raw_csv(input_path)
-    messages, summary = transform_conversation_export(raw)
+    msg_path = out / f"clean_messages.{fmt.value}"
+    sum_path = out / f"conversation_summary.{fmt.value}"
+
+    n_messages = 0
+    n_conversations = 0
+
+    chunks = iter_raw_csv(input_path, chunksize=chunksize)
+    # Both outputs are written on worker threads while the next chunk is
+    # transformed; each writer has at most one write in flight.
+    with (
+        ChunkedWriter(msg_path, fmt.value, messages_schema()) as msg_writer,
+        ChunkedWriter(sum_path, fmt.value, summary_schema()) as sum_writer,
+        ThreadPoolExecutor(max_workers=2) as pool,
+    ):
+        pending = []
+        for messages, summary in transform_conversation_export_chunks(chunks):
+            basic_validation(messages)
 
-    basic_validation(messages)
+            for future in pending:
+                future.result()
+            pending = [
+                pool.submit(msg_writer.write, messages),
+                pool.submit(sum_writer.write, summary),
+            ]
 
-    msg_path = out / "clean_messages.csv"
-    sum_path = out / "conversation_summary.csv"
+            n_messages += messages.shape[0]
+            n_conversations += summary.shape[0]
 
-    messages.to_csv(msg_path, index=False)
-    summary.to_csv(sum_path, index=False)
+        for future in pending:
+            future.result()
 
     print("[green]Done.[/green]")
     print(f"- Messages: {msg_path}")
     print(f"- Summary : {sum_path}")
-    print(f"- Conversations: {summary.shape[0]}")
-    print(f"- Messages total: {messages.shape[0]}")
+    print(f"- Conversations: {n_conversations}")
+    print(f"- Messages total: {n_messages}")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,57 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv
+
+# Arrow-backed strings: .str.match / .fillna run on pyarrow.compute kernels
+RAW_DTYPE = pd.StringDtype("pyarrow")
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+# Fixed timestamp layout, so CSV output does not depend on how the
+# export was chunked (pandas otherwise picks a format per written frame)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Bytes per Arrow parse block (one streamed chunk per block)
+ARROW_BLOCK_SIZE = 16 << 20
+
+# pandas' default NA tokens, so both readers null the same cells
+NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 256_000
+
+
+def _use_arrow_io() -> bool:
+    """
+    Opt-in switch for the PyArrow CSV reader (USE_ARROW_IO=1).
+    The pandas reader remains the default and the reference behaviour.
+    """
+    return os.environ.get("USE_ARROW_IO") == "1"
 
 
 def read_raw_csv(path: str) -> pd.DataFrame:
@@ -6,4 +59,267 @@ def read_raw_csv(path: str) -> pd.DataFrame:
     Read the corrupted conversation export.
     The file has no reliable header, and data is stored as key/value rows.
     """
-    return pd.read_csv(path, header=None, names=["col1", "col2"], dtype=str)
+    if _use_arrow_io():
+        try:
+            return _read_raw_csv_arrow(path)
+        except pa.ArrowInvalid:
+            # e.g. a marker line without its trailing comma: pandas reads
+            # it with a null col2, the Arrow reader rejects the row
+            pass
+    return pd.read_csv(path, header=None, names=["col1", "col2"], dtype=RAW_DTYPE)
+
+
+def iter_raw_csv(path: str, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Read the raw export as a stream of chunks (same columns as read_raw_csv).
+    chunksize is a row count for the pandas reader; the Arrow reader
+    yields one chunk per parsed record batch and ignores it.
+    """
+    if _use_arrow_io():
+        yield from _iter_raw_csv_arrow(path, chunksize)
+        return
+    yield from _iter_raw_csv_pandas(path, chunksize)
+
+
+def _iter_raw_csv_pandas(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    return pd.read_csv(
+        path,
+        header=None,
+        names=["col1", "col2"],
+        dtype=RAW_DTYPE,
+        chunksize=chunksize,
+    )
+
+
+def _arrow_raw_csv_options():
+    """
+    PyArrow reader options for the raw export.
+    Both columns are kept as (nullable) strings, so no value is
+    reinterpreted on the way in.
+    """
+    return dict(
+        read_options=csv.ReadOptions(
+            block_size=ARROW_BLOCK_SIZE,
+            column_names=["col1", "col2"],
+        ),
+        # Message bodies may contain quoted line breaks
+        parse_options=csv.ParseOptions(newlines_in_values=True),
+        convert_options=csv.ConvertOptions(
+            column_types={"col1": pa.string(), "col2": pa.string()},
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _read_raw_csv_arrow(path: str) -> pd.DataFrame:
+    """
+    Multi-threaded PyArrow parse of the raw export, returned as
+    Arrow-backed columns.
+    """
+    table = csv.read_csv(path, **_arrow_raw_csv_options())
+    return table.to_pandas(types_mapper=_arrow_types_mapper)
+
+
+def _iter_raw_csv_arrow(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Streaming PyArrow parse of the raw export. The reader parses ahead on
+    background threads while the caller transforms the current batch.
+
+    If the Arrow reader rejects a row the pandas reader accepts (a short
+    row), the stream continues with the pandas reader from the first row
+    not yet yielded.
+    """
+    yielded = 0
+    try:
+        with csv.open_csv(path, **_arrow_raw_csv_options()) as reader:
+            for batch in reader:
+                yielded += batch.num_rows
+                yield batch.to_pandas(types_mapper=_arrow_types_mapper)
+    except pa.ArrowInvalid:
+        for chunk in _iter_raw_csv_pandas(path, chunksize):
+            if yielded >= len(chunk):
+                yielded -= len(chunk)
+                continue
+            yield chunk.iloc[yielded:]
+            yielded = 0
+
+
+def _arrow_types_mapper(arrow_type):
+    """
+    Map Arrow strings to the same pandas dtype as the default reader.
+    """
+    if arrow_type == pa.string():
+        return RAW_DTYPE
+    return None
+
+
+# ---------------------------------------------------------------------
+# Output writers
+# ---------------------------------------------------------------------
+
+def messages_schema():
+    """
+    Arrow schema of the message-level output (Parquet format).
+    """
+    return pa.schema(
+        [
+            ("extraction_group_id", pa.string()),
+            ("conversation_uid", pa.string()),
+            ("conversation_block_id", pa.int64()),
+            ("conversation_id", pa.string()),
+            ("conversation_id_is_uuid", pa.bool_()),
+            ("platform_call_id", pa.string()),
+            ("conversation_datetime", pa.timestamp("ns")),
+            ("sender_email", pa.string()),
+            ("message_text", pa.string()),
+            ("message_len", pa.int64()),
+            ("message_status", pa.dictionary(pa.int8(), pa.string())),
+            ("has_deleted_in_conversation", pa.bool_()),
+            ("message_sequence", pa.int64()),
+            ("row_num", pa.int64()),
+            ("conv_seq", pa.int64()),
+        ]
+    )
+
+
+def summary_schema():
+    """
+    Arrow schema of the conversation-level output (Parquet format).
+    """
+    return pa.schema(
+        [
+            ("conv_seq", pa.int64()),
+            ("extraction_group_id", pa.string()),
+            ("conversation_uid", pa.string()),
+            ("conversation_id", pa.string()),
+            ("platform_call_id", pa.string()),
+            ("conversation_datetime", pa.timestamp("ns")),
+            ("message_count", pa.int64()),
+            ("participants", pa.list_(pa.string())),
+            ("deleted_count", pa.int64()),
+            ("has_deleted_messages", pa.bool_()),
+        ]
+    )
+
+
+def _arrow_list_columns(df: pd.DataFrame) -> list:
+    """
+    Names of the Arrow list columns of a frame (e.g. participants).
+    """
+    return [
+        name
+        for name, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.ArrowDtype) and pa.types.is_list(dtype.pyarrow_dtype)
+    ]
+
+
+def _with_list_literals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Arrow list columns as Python lists, so CSV cells read "['a', 'b']"
+    rather than the NumPy array repr.
+    """
+    lists = {
+        name: pd.Series(df[name].tolist(), index=df.index, dtype=object)
+        for name in _arrow_list_columns(df)
+    }
+    return df.assign(**lists) if lists else df
+
+
+class ChunkedWriter:
+    """
+    Append DataFrame chunks to a single CSV or Parquet file.
+
+    Parquet files are written against a fixed schema, so every chunk
+    (including chunks without any message) produces the same column types.
+
+    Chunks are written to a temporary file next to the target, which only
+    replaces the target once the writer is closed without error. A failed
+    run never leaves a truncated output that looks complete.
+    """
+
+    def __init__(self, path: Path, fmt: str = "csv", schema=None):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {fmt}")
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.fmt = fmt
+        self.schema = schema
+        self._parquet = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.fmt == "csv":
+            _with_list_literals(df).to_csv(
+                self.tmp_path,
+                mode="w" if self._first else "a",
+                header=self._first,
+                index=False,
+                date_format=DATE_FORMAT,
+            )
+        else:
+            self._write_parquet(df)
+        self._first = False
+
+    def _write_parquet(self, df: pd.DataFrame) -> None:
+        # Arrow list columns are attached as-is: pandas metadata would
+        # record their dtype in a form read_parquet cannot parse back
+        lists = _arrow_list_columns(df)
+        base = df.drop(columns=lists)
+        schema = self.schema
+        if schema is not None:
+            schema = pa.schema([schema.field(name) for name in base.columns])
+        table = pa.Table.from_pandas(base, schema=schema, preserve_index=False)
+        for name in lists:
+            values = df[name].array.__arrow_array__()
+            field = (
+                self.schema.field(name)
+                if self.schema is not None
+                else pa.field(name, values.type)
+            )
+            table = table.add_column(
+                df.columns.get_loc(name), field, values.cast(field.type)
+            )
+
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(
+                self.tmp_path, table.schema, compression=PARQUET_COMPRESSION
+            )
+        self._parquet.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+    def close(self) -> None:
+        """
+        Finalise the output and move it to its target path. If nothing was
+        written (empty export), the output is an empty table with the
+        schema's columns.
+        """
+        if self._first:
+            self.write(
+                self.schema.empty_table().to_pandas()
+                if self.schema is not None
+                else pd.DataFrame()
+            )
+        self._close_file()
+        if self.tmp_path.exists():
+            os.replace(self.tmp_path, self.path)
+
+    def discard(self) -> None:
+        """
+        Close and delete the partial output; the target path is left untouched.
+        """
+        self._close_file()
+        self.tmp_path.unlink(missing_ok=True)
+
+    def _close_file(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self) -> "ChunkedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -1,8 +1,12 @@
 import re
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from numba import njit
 
 # ---------------------------------------------------------------------
 # Regex patterns
@@ -20,6 +24,32 @@ UUID_RE = re.compile(
     r"[0-9a-fA-F]{12}$"
 )
 
+
+# Cheap Arrow predicates that must hold for a pattern to match. The regex
+# (RE2, in pyarrow.compute) then only runs on the rows they select.
+def _contains_at(arr: pa.Array) -> pa.Array:
+    return pc.match_substring(arr, "@")
+
+
+def _has_uuid_length(arr: pa.Array) -> pa.Array:
+    return pc.equal(pc.utf8_length(arr), 36)
+
+
+# Metadata keys propagated to every message of a block (col1 -> col2)
+META_KEYS = ("Conversation Identifier:", "Platform Call ID:", "Date and time:")
+
+# Row kinds used by the block scan; metadata rows are ROW_META + key index
+ROW_OTHER = 0
+ROW_BLOCK_START = 1
+ROW_MESSAGE = 2
+ROW_META = 3
+
+# Message status as a two-value categorical (int8 codes: 0 normal, 1 deleted)
+MESSAGE_STATUS_DTYPE = pd.CategoricalDtype(["normal", "deleted"])
+
+# Output string columns are Arrow-backed, like the raw input columns
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
 # ---------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------
@@ -37,19 +67,144 @@ class TransformConfig:
 # Internal helpers
 # ---------------------------------------------------------------------
 
-def _pull_meta(df: pd.DataFrame, key_name: str) -> pd.Series:
+def _as_arrow(values: pd.Series) -> pa.Array:
+    """
+    Arrow string view of a column (zero-copy for single-chunk Arrow-backed
+    strings; columns concatenated from several chunks are combined).
+    Columns that do not hold strings (e.g. a numeric col2) are cast to
+    strings first, as astype("string") would.
     """
-    Within each conversation block (conv_seq), extract the first value
-    of a given metadata key and propagate it to all rows in the block.
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        values = values.astype(STRING_DTYPE)
+    arr = pa.array(values, type=pa.string(), from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    return arr
+
+
+def _match_regex(
+    arr: pa.Array,
+    pattern: re.Pattern,
+    prefilter: Optional[Callable[[pa.Array], pa.Array]] = None,
+) -> np.ndarray:
     """
+    Boolean mask of values matching a precompiled pattern (nulls -> False).
+
+    Matching runs on pyarrow.compute (RE2) over the Arrow buffer rather
+    than Python's re per element. When a `prefilter` predicate is given,
+    the regex is only evaluated on the values it selects.
+    """
+    arr = pc.fill_null(arr, "")
+    if prefilter is None:
+        matched = pc.match_substring_regex(arr, pattern.pattern)
+        return matched.to_numpy(zero_copy_only=False)
+
+    candidates = prefilter(arr).to_numpy(zero_copy_only=False)
+    result = np.zeros(len(arr), dtype=bool)
+    result[candidates] = pc.match_substring_regex(
+        pc.filter(arr, candidates), pattern.pattern
+    ).to_numpy(zero_copy_only=False)
+    return result
+
+
+@njit(cache=True)
+def _scan_blocks(conv_seq, kind, has_value, is_deleted, n_blocks, n_keys):
+    """
+    Single pass over the rows of complete conversation blocks.
+
+    Rows are grouped contiguously by conv_seq. For each block, records the
+    marker row, the first row holding a non-null value for each metadata
+    key, and message / deleted-message counts. For each message row,
+    records its position, its block and its sequence within the block.
+    """
+    n = len(kind)
+    msg_row = np.empty(n, dtype=np.int64)
+    msg_block = np.empty(n, dtype=np.int64)
+    msg_seq = np.empty(n, dtype=np.int64)
+
+    block_seq = np.empty(n_blocks, dtype=np.int64)
+    block_start = np.full(n_blocks, -1, dtype=np.int64)
+    block_meta = np.full((n_blocks, n_keys), -1, dtype=np.int64)
+    block_messages = np.zeros(n_blocks, dtype=np.int64)
+    block_deleted = np.zeros(n_blocks, dtype=np.int64)
+
+    b = -1
+    m = 0
+    for i in range(n):
+        if b < 0 or conv_seq[i] != block_seq[b]:
+            b += 1
+            block_seq[b] = conv_seq[i]
+
+        k = kind[i]
+        if k == ROW_BLOCK_START:
+            if block_start[b] < 0:
+                block_start[b] = i
+        elif k == ROW_MESSAGE:
+            block_messages[b] += 1
+            if is_deleted[i]:
+                block_deleted[b] += 1
+            msg_row[m] = i
+            msg_block[m] = b
+            msg_seq[m] = block_messages[b]
+            m += 1
+        elif k >= ROW_META:
+            if has_value[i] and block_meta[b, k - ROW_META] < 0:
+                block_meta[b, k - ROW_META] = i
+
+    nb = b + 1
     return (
-        df["col2"]
-        .where(df["col1"].eq(key_name))
-        .groupby(df["conv_seq"])
-        .transform("first")
+        msg_row[:m],
+        msg_block[:m],
+        msg_seq[:m],
+        block_seq[:nb],
+        block_start[:nb],
+        block_meta[:nb],
+        block_messages[:nb],
+        block_deleted[:nb],
     )
 
 
+def _take(arr: pa.Array, positions: np.ndarray) -> pa.Array:
+    """
+    Gather values by row position; negative positions give nulls.
+    """
+    return arr.take(pa.array(positions, mask=positions < 0))
+
+
+def _strings(arr: pa.Array) -> pd.arrays.ArrowStringArray:
+    return pd.array(arr, dtype=STRING_DTYPE)
+
+
+def _last_block_start(col1: pd.Series) -> int:
+    """
+    Position of the last conversation block marker in a chunk, or -1.
+    """
+    starts = np.flatnonzero(_match_regex(_as_arrow(col1), BLOCK_RE))
+    return int(starts[-1]) if starts.size else -1
+
+
+def _iter_complete_blocks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Re-cut raw chunks on block markers so that a conversation block is
+    never split across two yielded frames. Rows since the last marker are
+    carried over into the next chunk.
+    """
+    pending: List[pd.DataFrame] = []
+    for chunk in chunks:
+        cut = _last_block_start(chunk["col1"])
+        if cut < 0:
+            pending.append(chunk)
+            continue
+
+        head = pending + [chunk.iloc[:cut]]
+        if sum(len(part) for part in head):
+            yield pd.concat(head, ignore_index=True)
+        pending = [chunk.iloc[cut:]]
+
+    if sum(len(part) for part in pending):
+        yield pd.concat(pending, ignore_index=True)
+
+
 # ---------------------------------------------------------------------
 # Main transformation
 # ---------------------------------------------------------------------
@@ -68,147 +223,199 @@ def transform_conversation_export(
     - transformations are deterministic
     - all rows remain traceable to the source export
     """
+    df = _detect_blocks(raw)
+    return _transform_blocks(df, config)
+
+
+def transform_conversation_export_chunks(
+    chunks: Iterable[pd.DataFrame],
+    config: TransformConfig = TransformConfig(),
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Streaming variant of transform_conversation_export.
+
+    Raw chunks are re-cut on block boundaries and transformed batch by
+    batch, yielding (messages, summary) pairs. row_num and conv_seq keep
+    counting across batches, so the concatenated output is identical to
+    the in-memory transformation of the whole export.
+    """
+    row_offset = 0
+    conv_offset = 0
+    for block in _iter_complete_blocks(chunks):
+        df = _detect_blocks(block, row_offset=row_offset, conv_offset=conv_offset)
+        row_offset += len(df)
+        conv_offset = int(df["conv_seq"].iloc[-1])
+        yield _transform_blocks(df, config)
 
-    df = raw.copy()
-    df["col1"] = df["col1"].astype("string")
-    df["col2"] = df["col2"].astype("string")
+
+def _detect_blocks(
+    raw: pd.DataFrame,
+    row_offset: int = 0,
+    conv_offset: int = 0,
+) -> pd.DataFrame:
+    """
+    Add row-level traceability and conversation block numbering.
+    Offsets allow a chunk to be numbered relative to the whole export.
+    """
+    # Shallow copy: new columns are added without duplicating col1/col2,
+    # and the caller's frame is left untouched
+    df = raw.copy(deep=False)
 
     # -----------------------------------------------------------------
     # Row-level traceability
     # -----------------------------------------------------------------
 
-    df["row_num"] = range(1, len(df) + 1)
+    df["row_num"] = range(row_offset + 1, row_offset + len(df) + 1)
 
     # -----------------------------------------------------------------
     # Conversation block detection
     # -----------------------------------------------------------------
 
-    df["is_conv_start"] = df["col1"].fillna("").str.match(BLOCK_RE)
-    df["conv_seq"] = df["is_conv_start"].cumsum()
+    df["is_conv_start"] = _match_regex(_as_arrow(df["col1"]), BLOCK_RE)
+    df["conv_seq"] = df["is_conv_start"].cumsum() + conv_offset
 
-    # APD marker = extraction / batch artifact (NOT a unique conversation ID)
-    df["extraction_group_id"] = (
-        df["col1"]
-        .where(df["is_conv_start"])
-        .groupby(df["conv_seq"])
-        .transform("first")
-    )
+    return df
 
-    # -----------------------------------------------------------------
-    # Metadata extraction
-    # -----------------------------------------------------------------
-
-    df["conversation_id"] = _pull_meta(df, "Conversation Identifier:")
-    df["platform_call_id"] = _pull_meta(df, "Platform Call ID:")
-    df["datetime_raw"] = _pull_meta(df, "Date and time:")
 
-    df["conversation_datetime"] = pd.to_datetime(
-        df["datetime_raw"],
-        format=config.datetime_format,
-        errors="coerce",
-    )
+def _transform_blocks(
+    df: pd.DataFrame,
+    config: TransformConfig,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build the message-level and conversation-level outputs from a frame
+    of complete conversation blocks (see _detect_blocks).
+
+    Rows are classified with vectorised Arrow kernels, then a single scan
+    (_scan_blocks) resolves blocks, metadata and message ordering. Output
+    columns are gathered by position from the raw Arrow columns, and
+    block-level values (metadata, timestamps, flags) are computed once
+    per block rather than once per row.
+    """
+    col1 = _as_arrow(df["col1"])
+    col2 = _as_arrow(df["col2"])
+    conv_seq = df["conv_seq"].to_numpy(dtype=np.int64)
 
     # -----------------------------------------------------------------
-    # Message identification
+    # Row classification
     # -----------------------------------------------------------------
 
-    df["is_message"] = df["col1"].fillna("").str.match(EMAIL_RE)
-    messages = df[df["is_message"]].copy()
+    kind = np.full(len(df), ROW_OTHER, dtype=np.int8)
+    kind[df["is_conv_start"].to_numpy(dtype=bool)] = ROW_BLOCK_START
+    kind[_match_regex(col1, EMAIL_RE, prefilter=_contains_at)] = ROW_MESSAGE
 
-    messages["sender_email"] = messages["col1"].fillna("")
-    messages["message_text"] = messages["col2"].fillna("")
+    key_index = pc.fill_null(
+        pc.index_in(col1, value_set=pa.array(META_KEYS)), -1
+    ).to_numpy(zero_copy_only=False)
+    is_meta = key_index >= 0
+    kind[is_meta] = ROW_META + key_index[is_meta]
 
-    messages["message_status"] = messages["message_text"].eq(
-        config.deleted_marker
-    ).map({True: "deleted", False: "normal"})
+    has_value = col2.is_valid().to_numpy(zero_copy_only=False)
+    is_deleted = pc.equal(
+        pc.fill_null(col2, ""), config.deleted_marker
+    ).to_numpy(zero_copy_only=False)
 
     # -----------------------------------------------------------------
-    # Stable identifiers (explicit and non-ambiguous)
+    # Block scan
     # -----------------------------------------------------------------
 
-    # Unique technical identifier for a conversation block in this export
-    messages["conversation_block_id"] = messages["conv_seq"]
-
-    # Human-readable unique identifier (safe to expose)
-    messages["conversation_uid"] = (
-        messages["extraction_group_id"].astype("string")
-        + "-"
-        + messages["conv_seq"].astype(str)
-    )
+    n_blocks = int(conv_seq[-1] - conv_seq[0] + 1) if len(df) else 0
+    (
+        msg_row,
+        msg_block,
+        msg_seq,
+        block_seq,
+        block_start,
+        block_meta,
+        block_messages,
+        block_deleted,
+    ) = _scan_blocks(conv_seq, kind, has_value, is_deleted, n_blocks, len(META_KEYS))
 
     # -----------------------------------------------------------------
-    # Data quality flags (do NOT alter source identifiers)
+    # Block-level values
     # -----------------------------------------------------------------
 
-    messages["conversation_id_is_uuid"] = (
-        messages["conversation_id"].fillna("").str.match(UUID_RE)
-    )
-
-    # -----------------------------------------------------------------
-    # Investigation-oriented features
-    # -----------------------------------------------------------------
+    # APD marker = extraction / batch artifact (NOT a unique conversation ID)
+    group_ids = _take(col1, block_start)
+    conversation_ids = _take(col2, block_meta[:, 0])
+    platform_call_ids = _take(col2, block_meta[:, 1])
 
-    messages["message_len"] = messages["message_text"].str.len()
+    block_datetime = pd.to_datetime(
+        _strings(_take(col2, block_meta[:, 2])),
+        format=config.datetime_format,
+        errors="coerce",
+    ).to_numpy(dtype="datetime64[ns]")
 
-    messages["has_deleted_in_conversation"] = (
-        messages.groupby("conv_seq")["message_status"]
-        .transform(lambda s: (s == "deleted").any())
+    # Human-readable unique identifier (safe to expose)
+    conversation_uids = pc.binary_join_element_wise(
+        group_ids, pc.cast(pa.array(block_seq), pa.string()), "-"
     )
 
+    # Data quality flag (does NOT alter source identifiers)
+    id_is_uuid = _match_regex(conversation_ids, UUID_RE, prefilter=_has_uuid_length)
+
     # -----------------------------------------------------------------
-    # Message ordering
+    # Final message-level dataset
     # -----------------------------------------------------------------
 
-    messages["message_sequence"] = (
-        messages.groupby("conv_seq").cumcount() + 1
+    message_text = pc.fill_null(col2.take(msg_row), "")
+
+    messages = pd.DataFrame(
+        {
+            "extraction_group_id": _strings(group_ids.take(msg_block)),
+            "conversation_uid": _strings(conversation_uids.take(msg_block)),
+            # Unique technical identifier for a conversation block in this export
+            "conversation_block_id": block_seq[msg_block],
+            "conversation_id": _strings(conversation_ids.take(msg_block)),
+            "conversation_id_is_uuid": id_is_uuid[msg_block],
+            "platform_call_id": _strings(platform_call_ids.take(msg_block)),
+            "conversation_datetime": block_datetime[msg_block],
+            "sender_email": _strings(pc.fill_null(col1.take(msg_row), "")),
+            "message_text": _strings(message_text),
+            "message_len": pc.utf8_length(message_text).to_numpy().astype(np.int64),
+            "message_status": pd.Categorical.from_codes(
+                is_deleted[msg_row].astype(np.int8), dtype=MESSAGE_STATUS_DTYPE
+            ),
+            "has_deleted_in_conversation": block_deleted[msg_block] > 0,
+            "message_sequence": msg_seq,
+            "row_num": df["row_num"].to_numpy()[msg_row],
+            "conv_seq": block_seq[msg_block],
+        }
     )
 
     # -----------------------------------------------------------------
-    # Final message-level dataset
+    # Conversation-level summary (blocks with at least one message)
     # -----------------------------------------------------------------
 
-    messages = messages[
-        [
-            "extraction_group_id",
-            "conversation_uid",
-            "conversation_block_id",
-            "conversation_id",
-            "conversation_id_is_uuid",
-            "platform_call_id",
-            "conversation_datetime",
-            "sender_email",
-            "message_text",
-            "message_len",
-            "message_status",
-            "has_deleted_in_conversation",
-            "message_sequence",
-            "row_num",
-            "conv_seq",
-        ]
-    ].reset_index(drop=True)
+    blocks = np.flatnonzero(block_messages > 0)
 
-    # -----------------------------------------------------------------
-    # Conversation-level summary
-    # -----------------------------------------------------------------
+    # Sorted distinct senders per block. Every summary block has at least
+    # one message, so the conv_seq runs of the sorted pairs line up with
+    # `blocks` and become the offsets of a list column.
+    pairs = (
+        messages[["conv_seq", "sender_email"]]
+        .drop_duplicates()
+        .sort_values(["conv_seq", "sender_email"])
+    )
+    pair_seq = pairs["conv_seq"].to_numpy()
+    offsets = np.append(
+        np.flatnonzero(np.diff(pair_seq, prepend=-1) != 0), len(pair_seq)
+    )
+    participants = pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()), _as_arrow(pairs["sender_email"])
+    )
 
-    conv_summary = (
-        messages.groupby(
-            [
-                "conv_seq",
-                "extraction_group_id",
-                "conversation_uid",
-                "conversation_id",
-                "platform_call_id",
-                "conversation_datetime",
-            ],
-            dropna=False,
-        )
-        .agg(
-            message_count=("message_text", "size"),
-            participants=("sender_email", lambda x: sorted(set(x))),
-            deleted_count=("message_status", lambda x: (x == "deleted").sum()),
-        )
-        .reset_index()
+    conv_summary = pd.DataFrame(
+        {
+            "conv_seq": block_seq[blocks],
+            "extraction_group_id": _strings(group_ids.take(blocks)),
+            "conversation_uid": _strings(conversation_uids.take(blocks)),
+            "conversation_id": _strings(conversation_ids.take(blocks)),
+            "platform_call_id": _strings(platform_call_ids.take(blocks)),
+            "conversation_datetime": block_datetime[blocks],
+            "message_count": block_messages[blocks],
+            "participants": pd.array(participants, dtype=pd.ArrowDtype(participants.type)),
+            "deleted_count": block_deleted[blocks],
+        }
     )
 
     conv_summary["has_deleted_messages"] = conv_summary["deleted_count"] > 0
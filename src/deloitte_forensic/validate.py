@@ -4,6 +4,8 @@ import pandas as pd
 def basic_validation(messages: pd.DataFrame) -> None:
     """
     Lightweight checks to ensure outputs are coherent and investigation-ready.
+    Checks reduce directly over the column buffers, without building
+    intermediate boolean columns.
     """
     required_cols = {
         "conversation_id",
@@ -17,8 +19,19 @@ def basic_validation(messages: pd.DataFrame) -> None:
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
 
-    if messages["sender_email"].isna().any():
+    if _has_nulls(messages["sender_email"]):
         raise ValueError("sender_email contains null values")
 
-    if (messages["message_sequence"] < 1).any():
+    sequence = messages["message_sequence"].to_numpy()
+    if sequence.size and sequence.min() < 1:
         raise ValueError("message_sequence must be >= 1")
+
+
+def _has_nulls(values: pd.Series) -> bool:
+    """
+    Arrow-backed columns keep their null count as array metadata; other
+    columns fall back to a scan.
+    """
+    if isinstance(values.array, pd.arrays.ArrowExtensionArray):
+        return values.array.__arrow_array__().null_count > 0
+    return bool(values.isna().any())
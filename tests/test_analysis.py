@@ -0,0 +1,195 @@
+import pandas as pd
+import pytest
+
+import message_store
+from deloitte_forensic.io import OUTPUT_FORMATS, RAW_DTYPE, ChunkedWriter, messages_schema
+from deloitte_forensic.transform import transform_conversation_export
+from forensic_features import burst_activity, compute_time_gaps
+from investigation_analysis import (
+    conversations_with_deleted_messages,
+    participant_activity,
+    timeline_activity,
+)
+from message_store import conversation_stats
+
+
+def _messages(**columns) -> pd.DataFrame:
+    return pd.DataFrame(columns)
+
+
+def test_timeline_activity_counts_active_hours_only():
+    df = _messages(
+        conversation_datetime=pd.to_datetime(
+            [
+                "2020-01-01 10:05:00",
+                "2020-01-01 10:55:00",
+                None,
+                "2020-01-01 13:00:00",
+            ]
+        )
+    )
+
+    result = timeline_activity(df)
+
+    assert result["hour"].tolist() == [
+        pd.Timestamp("2020-01-01 10:00:00"),
+        pd.Timestamp("2020-01-01 13:00:00"),
+    ]
+    assert result["message_count"].tolist() == [2, 1]
+
+
+def test_timeline_activity_all_dates_missing():
+    # e.g. a datetime_format mismatch coerces every date to NaT
+    df = _messages(conversation_datetime=pd.to_datetime([None, None]))
+
+    result = timeline_activity(df)
+
+    assert result.empty
+    assert list(result.columns) == ["hour", "message_count"]
+
+
+def test_conversations_with_deleted_messages_totals():
+    df = _messages(
+        conversation_uid=["A-1", "A-1", "A-1", "A-2", "A-3", "A-3"],
+        conversation_datetime=pd.to_datetime(["2020-01-01 10:00:00"] * 6),
+        sender_email=["a@x", "b@x", "a@x", "a@x", "b@x", "b@x"],
+        message_text=["hi", "gone", "gone", "hi", "gone", "yo"],
+        message_status=["normal", "deleted", "deleted", "normal", "deleted", "normal"],
+        has_deleted_in_conversation=[True, True, True, False, True, True],
+    )
+
+    result = conversations_with_deleted_messages(df)
+
+    assert result["conversation_uid"].tolist() == ["A-1", "A-3"]
+    assert result["deleted_message_count"].tolist() == [2, 1]
+    # Size of the deleted-message group, not the conversation size
+    assert result["total_messages"].tolist() == [2, 1]
+
+
+def test_burst_activity_derives_flags_from_time_gaps():
+    df = compute_time_gaps(
+        _messages(
+            conversation_uid=["A-1", "A-1", "A-1"],
+            conversation_datetime=pd.to_datetime(
+                ["2020-01-01 10:00:00", "2020-01-01 10:00:30", "2020-01-01 10:05:00"]
+            ),
+            message_text=["a", "b", "c"],
+        ),
+        burst_threshold_seconds=60,
+    )
+    # A later edit of the gaps must not be masked by the earlier flags
+    df["time_gap_seconds"] = [None, 300.0, 300.0]
+
+    result = burst_activity(df, burst_threshold_seconds=60)
+
+    assert result["burst_message_count"].tolist() == [0]
+    assert result["total_messages"].tolist() == [3]
+
+
+def test_compute_time_gaps_matches_groupby_shift():
+    df = _messages(
+        conversation_uid=["A-1", "A-2", "A-1", None, "A-2", "A-1", "A-1"],
+        conversation_datetime=pd.to_datetime(
+            [
+                "2020-01-01 10:00:00",
+                "2020-01-01 11:00:00",
+                "2020-01-01 10:00:45",
+                "2020-01-01 12:00:00",
+                None,
+                "2020-01-01 10:03:00",
+                "2020-01-01 10:03:10",
+            ]
+        ),
+        message_text=["a", "b", "c", "d", "e", "f", None],
+    )
+
+    result = compute_time_gaps(df, burst_threshold_seconds=60)
+
+    prev = df.groupby("conversation_uid")["conversation_datetime"].shift(1)
+    gaps = (df["conversation_datetime"] - prev).dt.total_seconds()
+    pd.testing.assert_series_equal(result["prev_message_time"], prev, check_names=False)
+    pd.testing.assert_series_equal(result["time_gap_seconds"], gaps, check_names=False)
+    assert result["is_burst_message"].tolist() == gaps.le(60).tolist()
+    assert "prev_message_time" not in df.columns
+
+
+def test_burst_activity_counts_per_conversation():
+    df = compute_time_gaps(
+        _messages(
+            conversation_uid=["A-2", "A-1", "A-2", "A-1", "A-1", "A-2"],
+            conversation_datetime=pd.to_datetime(
+                [
+                    "2020-01-01 11:00:00",
+                    "2020-01-01 10:00:00",
+                    "2020-01-01 11:10:00",
+                    "2020-01-01 10:00:30",
+                    "2020-01-01 10:01:00",
+                    "2020-01-01 11:10:20",
+                ]
+            ),
+            message_text=["a", "b", "c", "d", None, "f"],
+        ),
+        burst_threshold_seconds=60,
+    )
+
+    result = burst_activity(df, burst_threshold_seconds=60, is_burst=df["is_burst_message"])
+
+    assert result["conversation_uid"].tolist() == ["A-1", "A-2"]
+    assert result["burst_message_count"].tolist() == [2, 1]
+    # Messages without text are not counted
+    assert result["total_messages"].tolist() == [2, 3]
+    assert result["burst_ratio"].tolist() == [1.0, 1 / 3]
+    pd.testing.assert_frame_equal(result, burst_activity(df, burst_threshold_seconds=60))
+
+
+def test_participant_activity_counts_distinct_conversations():
+    df = _messages(
+        sender_email=pd.Categorical(
+            ["a@x", "a@x", "b@x", "a@x", "b@x", "c@x"],
+            categories=["a@x", "b@x", "c@x", "unused@x"],
+        ),
+        conversation_uid=["A-1", "A-1", "A-1", "A-2", None, "A-3"],
+        message_text=["hi", "again", "yo", "hi", "orphan", None],
+    )
+
+    result = participant_activity(df)
+
+    assert result["sender_email"].tolist() == ["a@x", "b@x", "c@x"]
+    assert result["message_count"].tolist() == [3, 2, 0]
+    # Repeated (sender, conversation) pairs and missing uids are not counted
+    assert result["conversations_involved"].tolist() == [2, 1, 1]
+
+
+@pytest.mark.parametrize("arrow_csv", [False, True])
+def test_load_messages_counts_do_not_depend_on_format(tmp_path, monkeypatch, arrow_csv):
+    raw = pd.DataFrame(
+        [
+            ("APD1", None),
+            ("Date and time:", "10/10/19 4:10:12 PM"),
+            ("a@b.com", "hello"),
+            ("c@d.com", None),
+            ("a@b.com", "[Deleted Message]"),
+            ("APD2", None),
+            ("c@d.com", None),
+        ],
+        columns=["col1", "col2"],
+        dtype=RAW_DTYPE,
+    )
+    messages, _ = transform_conversation_export(raw)
+
+    loaded = {}
+    for fmt in OUTPUT_FORMATS:
+        path = tmp_path / f"clean_messages.{fmt}"
+        with ChunkedWriter(path, fmt, messages_schema()) as writer:
+            writer.write(messages)
+        monkeypatch.setattr(message_store, "DATA_FORMAT", fmt)
+        monkeypatch.setattr(message_store, "DATA_PATH", path)
+        monkeypatch.setenv("USE_ARROW_IO", "1" if arrow_csv else "0")
+        loaded[fmt] = message_store.load_messages()
+
+    for df in loaded.values():
+        stats = conversation_stats(df)
+        # Empty message texts are not counted, whatever the format
+        assert stats["message_count"].tolist() == [2, 0]
+        assert stats["deleted_count"].tolist() == [1, 0]
+        assert participant_activity(df)["message_count"].tolist() == [2, 0]
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from cli import app
+from deloitte_forensic.io import messages_schema, summary_schema
+
+runner = CliRunner()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_empty_export_writes_empty_outputs(tmp_path, fmt):
+    raw = tmp_path / "raw.csv"
+    raw.write_text("")
+    out = tmp_path / "out"
+
+    result = runner.invoke(
+        app, ["--input-path", str(raw), "--out-dir", str(out), "--format", fmt]
+    )
+
+    assert result.exit_code == 0, result.output
+    read = pd.read_csv if fmt == "csv" else pd.read_parquet
+    messages = read(out / f"clean_messages.{fmt}")
+    summary = read(out / f"conversation_summary.{fmt}")
+    assert messages.empty and list(messages.columns) == messages_schema().names
+    assert summary.empty and list(summary.columns) == summary_schema().names
+    assert sorted(p.name for p in out.iterdir()) == [
+        f"clean_messages.{fmt}",
+        f"conversation_summary.{fmt}",
+    ]
+
+
+def test_chunksize_must_be_positive(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text("APD1,\n")
+
+    result = runner.invoke(
+        app, ["--input-path", str(raw), "--out-dir", str(tmp_path), "--chunksize", "0"]
+    )
+
+    assert result.exit_code != 0
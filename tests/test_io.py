@@ -0,0 +1,113 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from deloitte_forensic import io
+from deloitte_forensic.io import (
+    RAW_DTYPE,
+    ChunkedWriter,
+    iter_raw_csv,
+    messages_schema,
+    read_raw_csv,
+    summary_schema,
+)
+from deloitte_forensic.transform import transform_conversation_export
+
+
+def _assert_same_values(result, expected):
+    assert list(result.columns) == ["col1", "col2"]
+    pd.testing.assert_frame_equal(
+        result.astype(object).where(result.notna(), None).reset_index(drop=True),
+        expected.astype(object).where(expected.notna(), None).reset_index(drop=True),
+    )
+
+
+RAW_EXPORT = (
+    "APD1,\n"
+    "Conversation Identifier:,uuid-1\n"
+    "Date and time:,10/10/19 4:10:12 PM\n"
+    'a@b.com,"hello, world"\n'
+    "c@d.com,None\n"
+    'c@d.com,"multi\nline"\n'
+)
+
+
+@pytest.mark.parametrize("short_row", [False, True])
+def test_arrow_reader_matches_pandas_reader(tmp_path, monkeypatch, short_row):
+    path = tmp_path / "raw.csv"
+    # A marker line without its trailing comma has a single field
+    path.write_text(RAW_EXPORT + ("APD2\n" if short_row else "APD2,\n") + "a@b.com,<NA>\n")
+
+    monkeypatch.delenv("USE_ARROW_IO", raising=False)
+    expected = read_raw_csv(str(path))
+
+    monkeypatch.setenv("USE_ARROW_IO", "1")
+    _assert_same_values(read_raw_csv(str(path)), expected)
+
+    # Small parse blocks: the short row is met after batches were yielded
+    monkeypatch.setattr(io, "ARROW_BLOCK_SIZE", 64)
+    chunks = list(iter_raw_csv(str(path), chunksize=2))
+    assert len(chunks) > 1
+    _assert_same_values(pd.concat(chunks), expected)
+    assert expected["col2"].isna().tolist() == [
+        True, False, False, False, True, False, True, True
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_chunked_writer_discards_partial_output_on_error(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    schema = pa.schema([("a", pa.int64())])
+    chunk = pd.DataFrame({"a": [1, 2]})
+
+    with pytest.raises(RuntimeError):
+        with ChunkedWriter(path, fmt, schema) as writer:
+            writer.write(chunk)
+            raise RuntimeError("failed mid-run")
+
+    assert list(tmp_path.iterdir()) == []
+
+    with ChunkedWriter(path, fmt, schema) as writer:
+        writer.write(chunk)
+        writer.write(chunk)
+
+    assert list(tmp_path.iterdir()) == [path]
+    result = pd.read_csv(path) if fmt == "csv" else pd.read_parquet(path)
+    assert result["a"].tolist() == [1, 2, 1, 2]
+
+
+def test_chunked_writer_parquet_round_trip(tmp_path):
+    raw = pd.DataFrame(
+        [
+            ("APD1", None),
+            ("Conversation Identifier:", "uuid-1"),
+            ("Date and time:", "10/10/19 4:10:12 PM"),
+            ("c@d.com", "hello"),
+            ("a@b.com", None),
+            ("APD2", None),
+            ("a@b.com", "[Deleted Message]"),
+        ],
+        columns=["col1", "col2"],
+        dtype=RAW_DTYPE,
+    )
+    messages, summary = transform_conversation_export(raw)
+
+    msg_path = tmp_path / "clean_messages.parquet"
+    sum_path = tmp_path / "conversation_summary.parquet"
+    with ChunkedWriter(msg_path, "parquet", messages_schema()) as writer:
+        writer.write(messages.iloc[:2])
+        writer.write(messages.iloc[2:])
+    with ChunkedWriter(sum_path, "parquet", summary_schema()) as writer:
+        writer.write(summary)
+
+    assert pq.read_schema(msg_path).types == messages_schema().types
+    assert pq.read_schema(sum_path).types == summary_schema().types
+
+    result = pd.read_parquet(msg_path)
+    assert result["message_status"].tolist() == ["normal", "normal", "deleted"]
+    assert result["message_text"].tolist() == ["hello", "", "[Deleted Message]"]
+
+    result = pd.read_parquet(sum_path)
+    assert [list(p) for p in result["participants"]] == [["a@b.com", "c@d.com"], ["a@b.com"]]
+    assert result["deleted_count"].tolist() == [0, 1]
@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
 
-from deloitte_forensic.transform import transform_conversation_export
+from deloitte_forensic.io import RAW_DTYPE
+from deloitte_forensic.transform import (
+    transform_conversation_export,
+    transform_conversation_export_chunks,
+)
 
 
 def test_transform_adds_expected_fields_and_flags():
@@ -63,3 +68,181 @@ def test_transform_adds_expected_fields_and_flags():
     # Summary should reflect deletion
     assert int(summary.loc[0, "message_count"]) == 2
     assert bool(summary.loc[0, "has_deleted_messages"]) is True
+
+
+def test_chunked_transform_matches_in_memory_transform():
+    raw = pd.DataFrame(
+        {
+            "col1": [
+                "a@b.com",
+                "APD1",
+                "Conversation Identifier:",
+                "Date and time:",
+                "a@b.com",
+                "c@d.com",
+                "APD1",
+                "Platform Call ID:",
+                "c@d.com",
+                "APD3",
+                "Conversation Identifier:",
+                "APD2",
+                "Date and time:",
+                "a@b.com",
+            ],
+            "col2": [
+                "before first block",
+                "",
+                "uuid-1",
+                "10/10/19 4:10:12 PM",
+                "hello",
+                "[Deleted Message]",
+                "",
+                "platform-2",
+                "hi",
+                "",
+                "no-messages",
+                "",
+                "10/11/19 9:00:00 AM",
+                "bye",
+            ],
+        }
+    )
+
+    # Arrow-backed input is re-cut into multi-chunk Arrow columns
+    for raw in (raw, raw.astype(RAW_DTYPE)):
+        expected_messages, expected_summary = transform_conversation_export(raw)
+
+        for size in range(1, len(raw) + 1):
+            chunks = [raw.iloc[i : i + size] for i in range(0, len(raw), size)]
+            parts = list(transform_conversation_export_chunks(chunks))
+
+            messages = pd.concat([m for m, _ in parts], ignore_index=True)
+            summary = pd.concat([s for _, s in parts], ignore_index=True)
+
+            pd.testing.assert_frame_equal(messages, expected_messages)
+            pd.testing.assert_frame_equal(summary, expected_summary)
+
+
+def _raw(*rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["col1", "col2"], dtype=RAW_DTYPE)
+
+
+def test_first_non_null_metadata_value_wins():
+    raw = _raw(
+        ("APD1", None),
+        ("Conversation Identifier:", None),
+        ("Conversation Identifier:", "id-1"),
+        ("Date and time:", "10/10/19 4:10:12 PM"),
+        ("Conversation Identifier:", "id-2"),
+        ("Date and time:", "10/11/19 9:00:00 AM"),
+        ("a@b.com", "hello"),
+    )
+
+    messages, summary = transform_conversation_export(raw)
+
+    assert messages["conversation_id"].tolist() == ["id-1"]
+    assert summary["conversation_id"].tolist() == ["id-1"]
+    assert messages["conversation_datetime"].tolist() == [
+        pd.Timestamp("2019-10-10 16:10:12")
+    ]
+
+
+def test_missing_metadata_key_gives_null():
+    raw = _raw(
+        ("APD1", None),
+        ("Conversation Identifier:", "id-1"),
+        ("a@b.com", "hello"),
+        ("APD2", None),
+        ("Platform Call ID:", "platform-2"),
+        ("Date and time:", "10/11/19 9:00:00 AM"),
+        ("c@d.com", "hi"),
+    )
+
+    messages, summary = transform_conversation_export(raw)
+
+    assert messages["platform_call_id"].isna().tolist() == [True, False]
+    assert messages["conversation_id"].isna().tolist() == [False, True]
+    assert messages["conversation_datetime"].isna().tolist() == [True, False]
+    assert summary["platform_call_id"].isna().tolist() == [True, False]
+
+
+def test_messages_before_first_block_have_no_conversation():
+    raw = _raw(
+        ("a@b.com", "orphan"),
+        ("APD1", None),
+        ("c@d.com", "hi"),
+    )
+
+    messages, summary = transform_conversation_export(raw)
+
+    assert messages["conv_seq"].tolist() == [0, 1]
+    assert messages["extraction_group_id"].isna().tolist() == [True, False]
+    assert messages["conversation_uid"].isna().tolist() == [True, False]
+    assert messages["conversation_uid"].iloc[1] == "APD1-1"
+    assert messages["message_sequence"].tolist() == [1, 1]
+    assert summary["conversation_uid"].isna().tolist() == [True, False]
+
+
+def test_blocks_without_messages_are_left_out_of_summary():
+    raw = _raw(
+        ("APD1", None),
+        ("Conversation Identifier:", "id-1"),
+        ("APD2", None),
+        ("Conversation Identifier:", "id-2"),
+        ("a@b.com", "hello"),
+        ("c@d.com", "[Deleted Message]"),
+        ("a@b.com", "bye"),
+        ("APD3", None),
+    )
+
+    messages, summary = transform_conversation_export(raw)
+
+    assert messages["conv_seq"].tolist() == [2, 2, 2]
+    assert messages["message_sequence"].tolist() == [1, 2, 3]
+    assert summary["conv_seq"].tolist() == [2]
+    assert summary["conversation_uid"].tolist() == ["APD2-2"]
+    assert summary["message_count"].tolist() == [3]
+    assert summary["deleted_count"].tolist() == [1]
+    assert summary["participants"].tolist() == [["a@b.com", "c@d.com"]]
+
+
+def test_object_input_with_nan_matches_arrow_input():
+    rows = [
+        ("a@b.com", np.nan),
+        ("APD1", np.nan),
+        ("Conversation Identifier:", np.nan),
+        ("Conversation Identifier:", "id-1"),
+        ("Date and time:", "10/10/19 4:10:12 PM"),
+        (np.nan, "noise"),
+        ("a@b.com", np.nan),
+        ("c@d.com", "[Deleted Message]"),
+    ]
+    raw = pd.DataFrame(rows, columns=["col1", "col2"], dtype=object)
+
+    messages, summary = transform_conversation_export(raw)
+    expected_messages, expected_summary = transform_conversation_export(
+        raw.astype(RAW_DTYPE)
+    )
+
+    pd.testing.assert_frame_equal(messages, expected_messages)
+    pd.testing.assert_frame_equal(summary, expected_summary)
+    assert messages["message_text"].tolist() == ["", "", "[Deleted Message]"]
+    assert messages["message_len"].tolist() == [0, 0, 17]
+    assert messages["message_status"].tolist() == ["normal", "normal", "deleted"]
+    assert messages["conversation_id"].fillna("").tolist() == ["", "id-1", "id-1"]
+
+
+def test_non_string_columns_are_read_as_strings():
+    # pandas stores an all-numeric col2 as float64
+    raw = pd.DataFrame(
+        {
+            "col1": ["APD1", "Conversation Identifier:", "a@b.com", "c@d.com"],
+            "col2": [None, 7, 123, 42],
+        }
+    )
+
+    messages, summary = transform_conversation_export(raw)
+
+    assert messages["message_text"].tolist() == ["123.0", "42.0"]
+    assert messages["conversation_id"].tolist() == ["7.0", "7.0"]
+    assert summary["message_count"].tolist() == [2]
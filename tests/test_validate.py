@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from deloitte_forensic.io import RAW_DTYPE
+from deloitte_forensic.validate import basic_validation
+
+
+def _messages(sender_email, dtype) -> pd.DataFrame:
+    n = len(sender_email)
+    return pd.DataFrame(
+        {
+            "conversation_id": ["id-1"] * n,
+            "platform_call_id": ["platform-1"] * n,
+            "conversation_datetime": pd.to_datetime(["2020-01-01"] * n),
+            "sender_email": pd.Series(sender_email, dtype=dtype),
+            "message_text": ["hi"] * n,
+            "message_sequence": list(range(1, n + 1)),
+        }
+    )
+
+
+@pytest.mark.parametrize("dtype", [RAW_DTYPE, object])
+def test_null_sender_email_is_rejected(dtype):
+    basic_validation(_messages(["a@b.com", "c@d.com"], dtype))
+
+    with pytest.raises(ValueError, match="sender_email"):
+        basic_validation(_messages(["a@b.com", None], dtype))
+
+
+def test_mixed_type_sender_email_raises_value_error():
+    with pytest.raises(ValueError, match="sender_email"):
+        basic_validation(_messages(["a@b.com", 1.5, None], object))